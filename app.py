@@ -6,14 +6,78 @@ This Flask application provides a REST API endpoint to predict battery health
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 import joblib
-import pandas as pd
 import numpy as np
 import json
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple
+from sklearn.preprocessing import StandardScaler
+from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from compute_feature_medians import EXCLUDE_COLS, compute_feature_medians
+from schema import FIELDS, REQUIRED_FIELDS, RANGE_ERRORS, decode_predict_input
+
+# Numba JIT for the per-request feature kernel (falls back to plain Python)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Feature kernel: ahead-of-time compiled if build_kernels.py has been run,
+# otherwise JIT-compiled from feature_kernels.py
+try:
+    from battery_kernels import fill_features as _fill
+    KERNELS_AOT = True
+except ImportError:
+    from feature_kernels import fill_features
+    _fill = njit(cache=True)(fill_features)
+    KERNELS_AOT = False
+
+# ONNX Runtime for models exported by export_onnx.py (optional)
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+ONNX_MODEL_PATH = 'battery_health_model.onnx'
+
+# orjson for request parsing and response serialization (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 
 # Global variables to store loaded model and scaler
 model = None
@@ -22,6 +86,54 @@ feature_names = None
 feature_medians = None
 model_info = None
 
+# Precomputed at load time for the prediction hot path
+feature_idx: Dict[str, int] = {}
+BASELINE = None  # feature medians as an array, in feature_names order
+
+# Column index of each feature prepare_features writes (-1 if not used by the model)
+I_TEMP = I_VOLT = I_MAXV = I_MINV = I_CUR = I_CYC = -1
+I_CSQ = I_VDROP = I_ED = I_TDEV = I_T415 = I_EXPT = I_TCC = -1
+
+# Request features are float32, the input dtype sklearn trees and XGBoost use
+# natively; scaling still computes in float64 (see scale_features)
+FEATURE_DTYPE = np.float32
+
+# StandardScaler parameters for in-place scaling (None = use scaler.transform)
+SCALER_MEAN = None
+SCALER_SCALE = None
+
+# Native scale+predict: numba kernels or ONNX Runtime (None = use model.predict)
+fused_predict = None
+
+# Micro-batching of concurrent requests into one model.predict call. Off by
+# default: every batched request waits out the batch window, which only pays
+# off when many requests arrive together (multi-threaded servers under load)
+PREDICT_BATCH_SIZE = int(os.environ.get('PREDICT_BATCH_SIZE', 1))
+PREDICT_BATCH_WAIT_MS = float(os.environ.get('PREDICT_BATCH_WAIT_MS', 5))
+# Seconds a request waits for its batched prediction before failing with a 500
+PREDICT_BATCH_TIMEOUT_S = float(os.environ.get('PREDICT_BATCH_TIMEOUT_S', 5))
+batcher = None
+
+# Row -> prediction strategy chosen at load time by select_prediction_path()
+predict_row = None
+
+# Predictions memoized on quantized inputs (0 disables the cache)
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 4096))
+
+# /predict success body; %.2f matches the previous round(value, 2) and %r
+# writes each float's shortest exact repr
+SUCCESS_RESPONSE_TMPL = (
+    '{"predicted_rul":%.2f,"battery_health_percentage":%.2f,"status":"success",'
+    '"input_data":{"battery_temperature":%r,"voltage":%r,"current":%r,'
+    '"charging_cycles":%r,"state_of_charge":%r}}\n'
+)
+
+# Per-thread (1, N) request buffers, allocated once per worker thread. They are
+# only reused under servers with a fixed thread pool (gunicorn gthread,
+# waitress); Werkzeug's dev server (`python app.py`) starts a new thread per
+# request, so there every request allocates fresh buffers.
+_TLS = threading.local()
+
 def load_model_and_scaler():
     """Load the trained model, scaler, and feature information."""
     global model, scaler, feature_names, feature_medians, model_info
@@ -49,121 +161,434 @@ def load_model_and_scaler():
             # If model_info.json doesn't exist, try to infer from dataset
             print("⚠ model_info.json not found. Attempting to infer features from dataset...")
             if os.path.exists('data/merged_battery_data.csv'):
-                df = pd.read_csv('data/merged_battery_data.csv', nrows=100)
-                exclude_cols = ['RUL', 'Exp_Cell_Type']
-                feature_names = [col for col in df.columns 
-                               if col not in exclude_cols and df[col].dtype in [np.int64, np.float64]]
+                # Every column except the target and the categorical cell type is numeric
+                with open('data/merged_battery_data.csv', 'r') as f:
+                    header = f.readline().rstrip('\r\n').split(',')
+                feature_names = [col for col in header if col not in EXCLUDE_COLS]
                 print(f"✓ Inferred {len(feature_names)} features from dataset")
             else:
                 raise FileNotFoundError("Cannot determine feature names. Please ensure model_info.json exists or dataset is available.")
         
-        # Calculate feature medians from training data for missing features
-        if os.path.exists('data/merged_battery_data.csv'):
-            df = pd.read_csv('data/merged_battery_data.csv')
-            exclude_cols = ['RUL', 'Exp_Cell_Type']
-            numeric_cols = [col for col in df.columns 
-                          if col not in exclude_cols and df[col].dtype in [np.int64, np.float64]]
-            feature_medians = df[numeric_cols].median().to_dict()
+        # Feature medians fill in features the API does not receive.
+        # They are precomputed into model_info.json by compute_feature_medians.py
+        if model_info and 'feature_medians' in model_info:
+            feature_medians = model_info['feature_medians']
+            print("✓ Feature medians loaded from model_info.json")
+        elif os.path.exists('data/merged_battery_data.csv'):
+            feature_medians = compute_feature_medians('data/merged_battery_data.csv')
             print("✓ Feature medians calculated from dataset")
         else:
             # Use default medians if dataset not available
             feature_medians = {}
             print("⚠ Dataset not found. Using default values for missing features.")
         
+        build_feature_index()
+        load_scaler_params()
+        build_fused_predictor()
+        start_batcher()
+        select_prediction_path()
+        _cached_predict.cache_clear()
+        warm_up()
+        
     except Exception as e:
         print(f"❌ Error loading model: {str(e)}")
         raise
 
 
-def prepare_features(user_input: Dict[str, Any]) -> np.ndarray:
+def build_feature_index():
+    """Resolve feature positions and the median baseline once, after loading."""
+    global feature_idx, BASELINE
+    global I_TEMP, I_VOLT, I_MAXV, I_MINV, I_CUR, I_CYC
+    global I_CSQ, I_VDROP, I_ED, I_TDEV, I_T415, I_EXPT, I_TCC
+    
+    feature_idx = {name: i for i, name in enumerate(feature_names)}
+    BASELINE = np.array([feature_medians.get(name, 0.0) for name in feature_names],
+                        dtype=FEATURE_DTYPE)
+    
+    I_TEMP = feature_idx.get('Exp_Temperature', -1)
+    I_VOLT = feature_idx.get('Exp_Voltage', -1)
+    I_MAXV = feature_idx.get('Max. Voltage Dischar. (V)', -1)
+    I_MINV = feature_idx.get('Min. Voltage Charg. (V)', -1)
+    I_CUR = feature_idx.get('Exp_Current', -1)
+    I_CYC = feature_idx.get('Cycle_Index', -1)
+    I_CSQ = feature_idx.get('cycle_squared', -1)
+    I_VDROP = feature_idx.get('voltage_drop', -1)
+    I_ED = feature_idx.get('energy_density', -1)
+    I_TDEV = feature_idx.get('temp_deviation', -1)
+    I_T415 = feature_idx.get('Time at 4.15V (s)', -1)
+    I_EXPT = feature_idx.get('Exp_Time', -1)
+    I_TCC = feature_idx.get('Time constant current (s)', -1)
+
+
+def load_scaler_params():
+    """Extract StandardScaler parameters so requests can be scaled in place."""
+    global SCALER_MEAN, SCALER_SCALE
+    
+    n = len(feature_names)
+    if isinstance(scaler, StandardScaler):
+        if scaler.with_mean and scaler.mean_ is not None:
+            SCALER_MEAN = np.asarray(scaler.mean_, dtype=np.float64)
+        else:
+            SCALER_MEAN = np.zeros(n, dtype=np.float64)
+        if scaler.with_std and scaler.scale_ is not None:
+            SCALER_SCALE = np.asarray(scaler.scale_, dtype=np.float64)
+        else:
+            SCALER_SCALE = np.ones(n, dtype=np.float64)
+    else:
+        # Other scalers go through scaler.transform
+        SCALER_MEAN = SCALER_SCALE = None
+
+
+def get_request_buffers() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return this thread's (features, scaled features) buffers, shaped (1, N).
+    
+    Allocated on a thread's first request; see _TLS for when they are reused.
+    """
+    n = len(feature_names)
+    buf = getattr(_TLS, 'buf', None)
+    if buf is None or buf.shape[1] != n:
+        buf = _TLS.buf = np.empty((1, n), dtype=FEATURE_DTYPE)
+        _TLS.scaled_buf = np.empty((1, n), dtype=FEATURE_DTYPE)
+    return buf, _TLS.scaled_buf
+
+
+def scale_features(feature_array: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Standardize `feature_array` into `out`.
+    
+    The arithmetic runs in float64 like StandardScaler did in training, and
+    the result is rounded once into the float32 `out`; scaling in float32
+    could land an ulp away and flip a tree split.
+    """
+    if SCALER_MEAN is None:
+        out[...] = scaler.transform(feature_array.astype(np.float64))
+        return out
+    np.divide(feature_array - SCALER_MEAN, SCALER_SCALE, out=out, casting='same_kind')
+    return out
+
+
+@njit(cache=True)
+def _predict_linear(row, weights, bias):
+    """Linear model with the scaler folded into `weights` and `bias`."""
+    out = bias
+    for j in range(row.shape[0]):
+        out += weights[j] * row[j]
+    return out
+
+
+@njit(cache=True)
+def _predict_forest(row, mean, scale, roots, left, right, feature, threshold, value):
+    """Average of flattened regression trees, standardizing features on the fly."""
+    total = 0.0
+    for t in range(roots.shape[0]):
+        node = roots[t]
+        while left[node] != -1:
+            f = feature[node]
+            # sklearn trees compare float32 inputs against float64 thresholds
+            x = np.float32((row[f] - mean[f]) / scale[f])
+            if x <= threshold[node]:
+                node = left[node]
+            else:
+                node = right[node]
+        total += value[node]
+    return total / roots.shape[0]
+
+
+def build_fused_predictor():
+    """
+    Pick a predictor that runs scaling and prediction as one native call.
+    
+    sklearn linear and tree models behind a StandardScaler are exported to
+    numba kernels; otherwise an ONNX export of scaler + model is served with
+    ONNX Runtime when available. If neither applies (fused_predict stays None),
+    requests use scaler + model.predict.
+    """
+    global fused_predict
+    fused_predict = _build_native_predictor() or _build_onnx_predictor()
+
+
+def _build_native_predictor():
+    """Export sklearn linear/tree model numerics to a numba kernel, or return None."""
+    # Without numba the kernels are plain Python loops, slower than model.predict
+    if not NUMBA_AVAILABLE or SCALER_MEAN is None:
+        return None
+    
+    if isinstance(model, (LinearRegression, Ridge, Lasso, ElasticNet)) and np.ndim(model.coef_) == 1:
+        # Fold the scaler into float64 weights; the float32 row is promoted per term
+        weights = np.asarray(model.coef_, dtype=np.float64) / SCALER_SCALE
+        bias = float(np.ravel(model.intercept_)[0]) - float((weights * SCALER_MEAN).sum())
+        print("✓ Using fused native predictor (linear)")
+        return lambda row: _predict_linear(row, weights, bias)
+    
+    if isinstance(model, DecisionTreeRegressor):
+        estimators = [model]
+    elif isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+        estimators = list(model.estimators_)
+    else:
+        return None
+    
+    if any(est.tree_.n_outputs != 1 for est in estimators):
+        return None
+    
+    roots, left, right, feature, threshold, value = [], [], [], [], [], []
+    offset = 0
+    for est in estimators:
+        tree = est.tree_
+        children_left = tree.children_left.astype(np.int64)
+        children_right = tree.children_right.astype(np.int64)
+        roots.append(offset)
+        left.append(np.where(children_left == -1, -1, children_left + offset))
+        right.append(np.where(children_right == -1, -1, children_right + offset))
+        feature.append(tree.feature.astype(np.int64))
+        # Thresholds stay float64: sklearn compares float32 inputs against
+        # float64 thresholds, and rounding them could flip splits
+        threshold.append(tree.threshold.astype(np.float64))
+        value.append(tree.value[:, 0, 0].astype(np.float64))
+        offset += tree.node_count
+    
+    tree_args = (
+        SCALER_MEAN, SCALER_SCALE,
+        np.array(roots, dtype=np.int64),
+        np.concatenate(left), np.concatenate(right), np.concatenate(feature),
+        np.concatenate(threshold), np.concatenate(value),
+    )
+    print(f"✓ Using fused native predictor ({len(estimators)} trees)")
+    return lambda row: _predict_forest(row, *tree_args)
+
+
+def _build_onnx_predictor():
+    """Serve the ONNX export from export_onnx.py with ONNX Runtime, or return None."""
+    if not ONNXRUNTIME_AVAILABLE or not os.path.exists(ONNX_MODEL_PATH):
+        return None
+    
+    # The export is a snapshot of the pickles; after retraining it would serve
+    # the old model, so skip it until export_onnx.py is rerun
+    onnx_mtime = os.path.getmtime(ONNX_MODEL_PATH)
+    if any(os.path.getmtime(path) > onnx_mtime
+           for path in ('battery_health_model.pkl', 'feature_scaler.pkl')):
+        print(f"⚠ {ONNX_MODEL_PATH} is older than the model/scaler pickles - ignoring it. "
+              "Rerun export_onnx.py to use ONNX Runtime.")
+        return None
+    
+    so = ort.SessionOptions()
+    so.intra_op_num_threads = 1
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(ONNX_MODEL_PATH, sess_options=so,
+                                   providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    print(f"✓ Using ONNX Runtime predictor ({ONNX_MODEL_PATH})")
+    # The ONNX graph contains the scaler, so it takes the unscaled row
+    return lambda row: session.run(None, {input_name: row.reshape(1, -1)})[0].reshape(-1)[0]
+
+
+class PredictionBatcher:
+    """
+    Collect concurrent single-row requests and run them through the scaler
+    and model as one (B, N) batch, paying sklearn's per-call overhead once.
+    """
+    
+    def __init__(self, n_features: int, max_batch_size: int = 32, batch_wait_timeout_s: float = 0.005):
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        # Rows are copied in here, so a batch never allocates on the way to the model
+        self._batch = np.empty((max_batch_size, n_features), dtype=FEATURE_DTYPE)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+        self._thread.start()
+    
+    def predict(self, feature_array: np.ndarray) -> float:
+        """Queue one (1, N) feature row and block until its prediction is ready."""
+        future = Future()
+        self._queue.put((feature_array, future))
+        try:
+            return future.result(timeout=PREDICT_BATCH_TIMEOUT_S)
+        except FutureTimeoutError:
+            raise PredictionError('Error making prediction: timed out waiting for the model') from None
+    
+    def _next_batch(self, futures: list):
+        """Fill the batch buffer, appending the futures of the rows it holds in order."""
+        row, future = self._queue.get()
+        futures.append(future)
+        np.copyto(self._batch[0], row[0])
+        deadline = time.monotonic() + self.batch_wait_timeout_s
+        while len(futures) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                row, future = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            futures.append(future)
+            np.copyto(self._batch[len(futures) - 1], row[0])
+    
+    def _run(self):
+        # Any failure is handed to the waiting requests; the thread never dies
+        while True:
+            futures = []
+            try:
+                self._next_batch(futures)
+                batch = self._batch[:len(futures)]
+                predictions = model.predict(scale_features(batch, out=batch))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future, value in zip(futures, predictions):
+                    future.set_result(float(value))
+
+
+def start_batcher():
+    """Start the prediction batcher for models that go through model.predict."""
+    global batcher
+    if fused_predict is None and PREDICT_BATCH_SIZE > 1:
+        batcher = PredictionBatcher(len(feature_names), PREDICT_BATCH_SIZE, PREDICT_BATCH_WAIT_MS / 1000.0)
+        print(f"✓ Batching predictions (max {PREDICT_BATCH_SIZE} rows, {PREDICT_BATCH_WAIT_MS:g} ms window)")
+    else:
+        batcher = None
+
+
+def prepare_features(temp: float, volt: float, cur: float, cyc: float, soc: float,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Convert user input to model features.
     
     Args:
-        user_input: Dictionary containing:
-            - battery_temperature: float
-            - voltage: float
-            - current: float
-            - charging_cycles: int/float
-            - state_of_charge: float (0-100)
+        temp: Battery temperature (°C)
+        volt: Voltage (V)
+        cur: Current (A)
+        cyc: Charging cycles
+        soc: State of charge (0-100)
+        out: Optional preallocated (1, N) FEATURE_DTYPE array to fill
     
     Returns:
         numpy array of features ready for model prediction
     """
-    # Start with medians/default values for all features
-    features = {name: feature_medians.get(name, 0.0) for name in feature_names}
-    
-    # Map user inputs to model features
-    # Direct mappings - check if feature exists in feature_names before assigning
-    if 'battery_temperature' in user_input:
-        if 'Exp_Temperature' in feature_names:
-            features['Exp_Temperature'] = user_input['battery_temperature']
-    
-    if 'voltage' in user_input:
-        voltage = user_input['voltage']
-        if 'Exp_Voltage' in feature_names:
-            features['Exp_Voltage'] = voltage
-        # Use voltage for both max and min voltage if not separately provided
-        if 'Max. Voltage Dischar. (V)' in feature_names:
-            features['Max. Voltage Dischar. (V)'] = voltage
-        if 'Min. Voltage Charg. (V)' in feature_names:
-            # Min voltage is typically lower, estimate based on voltage
-            features['Min. Voltage Charg. (V)'] = max(voltage - 0.5, 3.0)
-    
-    if 'current' in user_input:
-        if 'Exp_Current' in feature_names:
-            features['Exp_Current'] = user_input['current']
-    
-    if 'charging_cycles' in user_input:
-        cycles = float(user_input['charging_cycles'])
-        if 'Cycle_Index' in feature_names:
-            features['Cycle_Index'] = cycles
-        # Calculate cycle_squared if it exists
-        if 'cycle_squared' in feature_names:
-            features['cycle_squared'] = cycles ** 2
-    
-    # Calculate derived features if they exist
-    if 'voltage_drop' in feature_names:
-        if 'Max. Voltage Dischar. (V)' in features and 'Min. Voltage Charg. (V)' in features:
-            features['voltage_drop'] = features['Max. Voltage Dischar. (V)'] - features['Min. Voltage Charg. (V)']
-    
-    if 'energy_density' in feature_names:
-        # Estimate energy density (voltage * current * time approximation)
-        voltage_val = features.get('Exp_Voltage', features.get('Max. Voltage Dischar. (V)', 3.7))
-        current_val = features.get('Exp_Current', 2.0)
-        # Use time constant current if available, otherwise estimate
-        time_val = features.get('Time constant current (s)', 6000)
-        features['energy_density'] = voltage_val * time_val
-    
-    if 'temp_deviation' in feature_names and 'Exp_Temperature' in features:
-        # Calculate temperature deviation (assuming mean temp ~26 based on dataset)
-        temp_mean = 26.0  # Approximate mean from dataset
-        features['temp_deviation'] = features['Exp_Temperature'] - temp_mean
-    
-    # Handle state of charge if provided (can estimate some time-based features)
-    if 'state_of_charge' in user_input:
-        soc = user_input['state_of_charge'] / 100.0  # Convert to 0-1 range
-        # Estimate time-based features based on SOC
-        # Higher SOC might indicate longer charging time
-        if 'Time at 4.15V (s)' in feature_names:
-            # Estimate based on SOC (higher SOC = more time at high voltage)
-            features['Time at 4.15V (s)'] = 5000 + (soc * 1000)  # Rough estimate
-    
-    # Estimate Exp_Time based on cycles if not provided
-    if 'Exp_Time' in feature_names:
-        # Rough estimate: each cycle takes approximately 10000 seconds
-        if 'charging_cycles' in user_input:
-            cycles = float(user_input['charging_cycles'])
-            features['Exp_Time'] = cycles * 10000
-    
-    # Create feature array in the correct order
-    feature_array = np.array([features.get(name, feature_medians.get(name, 0.0)) 
-                              for name in feature_names]).reshape(1, -1)
-    
-    return feature_array
-
-
-def validate_input(data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    if out is None:
+        out = np.empty((1, len(feature_names)), dtype=FEATURE_DTYPE)
+    _fill(out[0], BASELINE, temp, volt, cur, cyc, soc,
+          I_TEMP, I_VOLT, I_MAXV, I_MINV, I_CUR, I_CYC,
+          I_CSQ, I_VDROP, I_ED, I_TDEV, I_T415, I_EXPT, I_TCC)
+    return out
+
+
+def _serving_path_matches(samples: np.ndarray, expected: np.ndarray) -> bool:
+    """Whether predict_row reproduces `expected` for every row of `samples`."""
+    _, scaled_buf = get_request_buffers()
+    actual = np.array([predict_row(samples[i:i + 1], scaled_buf) for i in range(len(samples))])
+    return np.allclose(actual, expected, rtol=1e-4, atol=1e-3)
+
+
+def warm_up():
+    """
+    Run predictions through the native kernels so JIT compilation happens at
+    startup, and check the active prediction path against the float64
+    reference: scaler.transform + model.predict, as in training.
+    
+    If the fused predictor disagrees on any sample row it is dropped and
+    requests go through scikit-learn instead.
+    """
+    global fused_predict
+    feature_array = prepare_features(25.0, 3.7, 1.0, 500.0, 75.0)
+    if fused_predict is not None:
+        fused_predict(feature_array[0])
+    
+    # Sample the low end, middle and high end of every input range
+    samples = np.concatenate([
+        prepare_features(*(lo + (hi - lo) * t for _, lo, hi, _ in FIELDS))
+        for t in (0.0, 0.25, 0.5, 0.75, 1.0)
+    ])
+    expected = model.predict(scaler.transform(samples.astype(np.float64)))
+    if fused_predict is not None and not _serving_path_matches(samples, expected):
+        print("⚠ Fused predictor does not match scaler + model.predict - using scikit-learn")
+        fused_predict = None
+        start_batcher()
+        select_prediction_path()
+    if fused_predict is None and not _serving_path_matches(samples, expected):
+        print("⚠ Scaled predictions do not match scaler.transform + model.predict")
+    print("✓ Feature kernel ready (" + ("ahead-of-time compiled" if KERNELS_AOT else
+                                         "numba JIT" if NUMBA_AVAILABLE else "pure Python") + ")")
+
+
+class PredictionError(Exception):
+    """A step of the prediction pipeline failed; the message is client-facing."""
+
+
+def _predict_fused(feature_array: np.ndarray, scaled_buf: np.ndarray) -> float:
+    return fused_predict(feature_array[0])
+
+
+def _predict_batched(feature_array: np.ndarray, scaled_buf: np.ndarray) -> float:
+    return batcher.predict(feature_array)
+
+
+def _predict_sklearn(feature_array: np.ndarray, scaled_buf: np.ndarray) -> float:
+    try:
+        feature_array_scaled = scale_features(feature_array, out=scaled_buf)
+    except Exception as e:
+        raise PredictionError(f'Error scaling features: {str(e)}') from e
+    return model.predict(feature_array_scaled)[0]
+
+
+def select_prediction_path():
+    """Resolve once, after loading, how a feature row becomes a prediction."""
+    global predict_row
+    if fused_predict is not None:
+        predict_row = _predict_fused
+    elif batcher is not None:
+        predict_row = _predict_batched
+    else:
+        predict_row = _predict_sklearn
+
+
+def run_prediction(temp: float, volt: float, cur: float, cyc: float, soc: float) -> float:
+    """
+    Run feature preparation, scaling and the model for one request.
+    
+    Returns:
+        Predicted RUL (non-negative)
+    
+    Raises:
+        PredictionError: with a client-facing message naming the failed step
+    """
+    buf, scaled_buf = get_request_buffers()
+    
+    # Prepare features
+    try:
+        feature_array = prepare_features(temp, volt, cur, cyc, soc, out=buf)
+    except Exception as e:
+        raise PredictionError(f'Error preparing features: {str(e)}') from e
+    
+    # Scale features and make prediction
+    try:
+        rul_prediction = predict_row(feature_array, scaled_buf)
+    except PredictionError:
+        raise
+    except Exception as e:
+        raise PredictionError(f'Error making prediction: {str(e)}') from e
+    
+    # Ensure RUL is non-negative
+    return max(0.0, float(rul_prediction))
+
+
+@lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def _cached_predict(temp_q: int, volt_q: int, cur_q: int, cyc_q: int, soc_q: int) -> float:
+    """run_prediction on quantized inputs: 0.1°C, 0.01V, 0.1A, whole cycles, whole %."""
+    return run_prediction(temp_q / 10.0, volt_q / 100.0, cur_q / 10.0, float(cyc_q), float(soc_q))
+
+
+def predict_rul(temp: float, volt: float, cur: float, cyc: float, soc: float) -> float:
+    """
+    Predict RUL, reusing earlier results for readings that quantize to the same key.
+    
+    Consecutive telemetry samples rarely differ at the quantization step, and
+    the RUL prediction is insensitive to changes below it.
+    """
+    return _cached_predict(round(temp * 10), round(volt * 100), round(cur * 10), round(cyc), round(soc))
+
+
+def validate_input(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[Tuple[float, float, float, float, float]]]:
     """
     Validate user input data.
     
@@ -171,51 +596,55 @@ def validate_input(data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         data: Input dictionary to validate
     
     Returns:
-        Tuple of (is_valid, error_message)
+        Tuple of (is_valid, error_message, parsed_values) where parsed_values is
+        (battery_temperature, voltage, current, charging_cycles, state_of_charge)
     """
-    required_fields = ['battery_temperature', 'voltage', 'current', 'charging_cycles', 'state_of_charge']
-    
     # Check for missing fields
-    missing_fields = [field for field in required_fields if field not in data]
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in data]
     if missing_fields:
-        return False, f"Missing required fields: {', '.join(missing_fields)}"
+        return False, f"Missing required fields: {', '.join(missing_fields)}", None
     
-    # Validate data types and ranges
-    try:
-        temp = float(data['battery_temperature'])
-        if temp < -20 or temp > 60:
-            return False, "battery_temperature must be between -20 and 60°C"
-        
-        voltage = float(data['voltage'])
-        if voltage < 2.5 or voltage > 4.5:
-            return False, "voltage must be between 2.5 and 4.5V"
-        
-        current = float(data['current'])
-        if current < 0 or current > 10:
-            return False, "current must be between 0 and 10A"
-        
-        cycles = float(data['charging_cycles'])
-        if cycles < 0 or cycles > 10000:
-            return False, "charging_cycles must be between 0 and 10000"
-        
-        soc = float(data['state_of_charge'])
-        if soc < 0 or soc > 100:
-            return False, "state_of_charge must be between 0 and 100"
-        
-    except (ValueError, TypeError) as e:
-        return False, f"Invalid data type: {str(e)}"
-    
-    return True, None
+    # Validate data types and ranges field by field, so the first bad field wins
+    values = []
+    for name, low, high, _ in FIELDS:
+        try:
+            value = float(data[name])
+        except (ValueError, TypeError) as e:
+            return False, f"Invalid data type: {str(e)}", None
+        if value < low or value > high:
+            return False, RANGE_ERRORS[name], None
+        values.append(value)
+    return True, None, tuple(values)
 
 
-@app.route('/health', methods=['GET'])
+@app.route('/health', methods=['GET', 'HEAD'])
 def health_check():
-    """Health check endpoint."""
+    """
+    Health check endpoint.
+    
+    Readiness is also reported in the X-Model-Loaded and X-Ready headers, so
+    a HEAD request answers without building a JSON body.
+    """
+    ready = model is not None and scaler is not None
+    headers = {
+        'X-Model-Loaded': '1' if model is not None else '0',
+        'X-Ready': '1' if ready else '0'
+    }
+    if request.method == 'HEAD':
+        return '', 200, headers
+    
+    cache_info = _cached_predict.cache_info()
     return jsonify({
         'status': 'healthy',
         'model_loaded': model is not None,
-        'scaler_loaded': scaler is not None
-    }), 200
+        'scaler_loaded': scaler is not None,
+        'prediction_cache': {
+            'hits': cache_info.hits,
+            'misses': cache_info.misses,
+            'size': cache_info.currsize,
+            'maxsize': cache_info.maxsize
+        }
+    }), 200, headers
 
 
 @app.route('/predict', methods=['POST'])
@@ -254,48 +683,33 @@ def predict():
                 'status': 'error'
             }), 400
         
-        data = request.get_json()
+        # Fast path: parse and validate the body in one pass
+        values = decode_predict_input(request.get_data())
         
-        if data is None:
-            return jsonify({
-                'error': 'No JSON data provided',
-                'status': 'error'
-            }), 400
+        if values is None:
+            data = request.get_json()
+            
+            if data is None:
+                return jsonify({
+                    'error': 'No JSON data provided',
+                    'status': 'error'
+                }), 400
+            
+            # Validate input (also builds the error message for invalid bodies)
+            is_valid, error_message, values = validate_input(data)
+            if not is_valid:
+                return jsonify({
+                    'error': error_message,
+                    'status': 'error'
+                }), 400
         
-        # Validate input
-        is_valid, error_message = validate_input(data)
-        if not is_valid:
-            return jsonify({
-                'error': error_message,
-                'status': 'error'
-            }), 400
+        temp, volt, cur, cyc, soc = values
         
-        # Prepare features
         try:
-            feature_array = prepare_features(data)
-        except Exception as e:
+            rul_prediction = predict_rul(temp, volt, cur, cyc, soc)
+        except PredictionError as e:
             return jsonify({
-                'error': f'Error preparing features: {str(e)}',
-                'status': 'error'
-            }), 500
-        
-        # Scale features
-        try:
-            feature_array_scaled = scaler.transform(feature_array)
-        except Exception as e:
-            return jsonify({
-                'error': f'Error scaling features: {str(e)}',
-                'status': 'error'
-            }), 500
-        
-        # Make prediction
-        try:
-            rul_prediction = model.predict(feature_array_scaled)[0]
-            # Ensure RUL is non-negative
-            rul_prediction = max(0, float(rul_prediction))
-        except Exception as e:
-            return jsonify({
-                'error': f'Error making prediction: {str(e)}',
+                'error': str(e),
                 'status': 'error'
             }), 500
         
@@ -305,19 +719,10 @@ def predict():
         max_rul = 1200  # Approximate maximum RUL from dataset
         battery_health_percentage = min(100, max(0, (rul_prediction / max_rul) * 100))
         
-        # Return prediction
-        return jsonify({
-            'predicted_rul': round(rul_prediction, 2),
-            'battery_health_percentage': round(battery_health_percentage, 2),
-            'status': 'success',
-            'input_data': {
-                'battery_temperature': data['battery_temperature'],
-                'voltage': data['voltage'],
-                'current': data['current'],
-                'charging_cycles': data['charging_cycles'],
-                'state_of_charge': data['state_of_charge']
-            }
-        }), 200
+        # Return prediction (inputs are echoed as the validated floats)
+        body = SUCCESS_RESPONSE_TMPL % (rul_prediction, battery_health_percentage,
+                                        temp, volt, cur, cyc, soc)
+        return app.response_class(body, status=200, mimetype='application/json')
     
     except Exception as e:
         return jsonify({
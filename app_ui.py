@@ -7,41 +7,28 @@ by connecting to the Flask API backend.
 
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import httpx
 import plotly.graph_objects as go
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Callable, BinaryIO
 import os
+import importlib.util
+from bisect import bisect_right
+import threading
+import time
+import json
+from functools import lru_cache
 from datetime import datetime
 import io
 
-# PDF generation
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-
-# Try to import OpenAI, fallback to HuggingFace if not available
-OPENAI_AVAILABLE = False
-HUGGINGFACE_AVAILABLE = False
-
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    from transformers import pipeline
-    import torch
-    HUGGINGFACE_AVAILABLE = True
-except ImportError:
-    HUGGINGFACE_AVAILABLE = False
+# Optional features. Only check that the packages are installed here; they are
+# imported on first use so sessions that never export a PDF or request AI
+# insights don't pay for loading reportlab or openai.
+REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+# The HuggingFace option is served by local rule-based insights, so it has no
+# extra dependencies.
+HUGGINGFACE_AVAILABLE = True
 
 # Page configuration
 st.set_page_config(
@@ -51,9 +38,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for styling
-st.markdown("""
-    <style>
+# Custom CSS for styling. The stylesheet for each theme is joined once at
+# import so every rerun sends a single <style> element.
+_BASE_CSS = """
     .main-header {
         font-size: 3rem;
         font-weight: bold;
@@ -91,21 +78,96 @@ st.markdown("""
     .stSlider > div > div > div {
         background-color: #1f77b4;
     }
-    </style>
-    """, unsafe_allow_html=True)
+    .hr {
+        border-top: 1px solid #eee;
+        margin: 1rem 0;
+    }
+"""
+
+_DARK_CSS = """
+    .stApp {
+        background-color: #1e1e1e;
+        color: #ffffff;
+    }
+    .main-header {
+        color: #4CAF50;
+    }
+    .info-box {
+        background-color: #2d2d2d;
+        color: #ffffff;
+    }
+    .metric-card {
+        background-color: #2d2d2d;
+    }
+    .stMetric {
+        background-color: #2d2d2d;
+    }
+"""
+
+# Section separator styled by the .hr rule above
+_SECTION_RULE = '<div class="hr"></div>'
+
+_THEME_CSS = {
+    'light': "<style>" + _BASE_CSS + "</style>",
+    'dark': "<style>" + _BASE_CSS + _DARK_CSS + "</style>",
+}
 
 # API Configuration
 API_URL = os.getenv("FLASK_API_URL", "http://127.0.0.1:5000")
 
+# OpenAI API key from the environment, read once at startup
+_ENV_OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+
+# Plotly options for st.plotly_chart. Figures set their own colours, so
+# Streamlit's theme overlay is skipped (theme=None). Scatter-type traces added
+# to the UI should use go.Scattergl so points render through WebGL.
+PLOTLY_CONFIG = {"staticPlot": False, "responsive": True}
+
 # Initialize session state for theme
 if 'theme' not in st.session_state:
     st.session_state.theme = 'light'
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def check_api_health() -> bool:
-    """Check if the Flask API is running and healthy."""
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Shared keep-alive HTTP session for API calls, reused across reruns and sessions."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+@st.cache_resource
+def get_httpx_client() -> httpx.Client:
+    """Shared httpx client with a bounded keep-alive pool for prediction calls."""
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    try:
+        # HTTP/2 is negotiated over TLS when the API is deployed behind HTTPS
+        return httpx.Client(limits=limits, http2=True)
+    except ImportError:
+        # The h2 package is not installed
+        return httpx.Client(limits=limits)
+
+# Seconds before a healthy probe result is refreshed
+HEALTH_PROBE_TTL = 300
+
+@st.cache_resource
+def _health_state() -> Dict[str, Any]:
+    """Last API health probe result, shared across reruns and sessions."""
+    return {"ok": False, "ts": 0.0, "refreshing": False, "lock": threading.Lock()}
+
+def _probe_api_health(session: requests.Session) -> bool:
+    """Query the Flask API /health endpoint."""
     try:
-        response = requests.get(f"{API_URL}/health", timeout=2)
+        response = session.head(f"{API_URL}/health", timeout=1)
+        if response.status_code != 200:
+            return False
+        ready = response.headers.get("X-Ready")
+        if ready is not None:
+            return ready == "1"
+        
+        # Older API versions only report readiness in the JSON body
+        response = session.get(f"{API_URL}/health", timeout=2)
         if response.status_code == 200:
             data = response.json()
             return data.get('model_loaded', False) and data.get('scaler_loaded', False)
@@ -113,6 +175,78 @@ def check_api_health() -> bool:
     except requests.exceptions.RequestException:
         return False
 
+def _record_health(state: Dict[str, Any], ok: bool):
+    """Store a probe result in the shared health state."""
+    with state["lock"]:
+        state["ok"] = ok
+        state["ts"] = time.time()
+        state["refreshing"] = False
+
+def check_api_health() -> bool:
+    """
+    Check if the Flask API is running and healthy.
+    
+    Probes synchronously until the API has been seen healthy. After that the
+    cached result is returned immediately and refreshed in a background
+    thread once it is older than HEALTH_PROBE_TTL seconds.
+    """
+    # Cached resources are resolved here, on the script thread: the refresh
+    # thread has no ScriptRunContext to call them with
+    state = _health_state()
+    session = get_http_session()
+    if not state["ok"]:
+        ok = _probe_api_health(session)
+        _record_health(state, ok)
+        return ok
+    
+    with state["lock"]:
+        stale = time.time() - state["ts"] > HEALTH_PROBE_TTL
+        start_refresh = stale and not state["refreshing"]
+        if start_refresh:
+            state["refreshing"] = True
+    if start_refresh:
+        threading.Thread(
+            target=lambda: _record_health(state, _probe_api_health(session)),
+            daemon=True
+        ).start()
+    return True
+
+class APIError(Exception):
+    """Error response returned by the prediction API."""
+
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def _predict_cached(
+    battery_temperature: float,
+    voltage: float,
+    current: float,
+    charging_cycles: float,
+    state_of_charge: float
+) -> Dict[str, Any]:
+    """
+    POST one prediction request, memoized on the five parameters.
+    
+    Failures raise instead of returning, so they are never cached.
+    """
+    response = get_httpx_client().post(
+        f"{API_URL}/predict",
+        json={
+            "battery_temperature": battery_temperature,
+            "voltage": voltage,
+            "current": current,
+            "charging_cycles": charging_cycles,
+            "state_of_charge": state_of_charge
+        },
+        headers={"Content-Type": "application/json"},
+        timeout=5
+    )
+    
+    if response.status_code == 200:
+        # A successful prediction doubles as a health probe
+        _record_health(_health_state(), True)
+        return response.json()
+    error_data = response.json()
+    raise APIError(error_data.get('error', 'Unknown error'))
+
 def predict_battery_health(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Send prediction request to Flask API.
@@ -124,52 +258,54 @@ def predict_battery_health(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         Prediction results or None if error
     """
     try:
-        response = requests.post(
-            f"{API_URL}/predict",
-            json=data,
-            headers={"Content-Type": "application/json"},
-            timeout=5
+        return _predict_cached(
+            data['battery_temperature'],
+            data['voltage'],
+            data['current'],
+            data['charging_cycles'],
+            data['state_of_charge']
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            error_data = response.json()
-            st.error(f"API Error: {error_data.get('error', 'Unknown error')}")
-            return None
-    except requests.exceptions.ConnectionError:
+    except APIError as e:
+        st.error(f"API Error: {str(e)}")
+        return None
+    except httpx.ConnectError:
         st.error(" Cannot connect to the API. Please ensure the Flask server is running on http://127.0.0.1:5000")
         return None
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         st.error(" Request timed out. Please try again.")
         return None
     except Exception as e:
         st.error(f" Unexpected error: {str(e)}")
         return None
 
+# Health status buckets: lower bounds and the (color, status) for each range,
+# from Poor (<40%) up to Excellent (>=80%)
+_HEALTH_THRESHOLDS = (40, 60, 80)
+_HEALTH_BUCKETS = (
+    ('#dc3545', "Poor"),       # Red
+    ('#fd7e14', "Fair"),       # Orange
+    ('#ffc107', "Good"),       # Yellow
+    ('#28a745', "Excellent"),  # Green
+)
+
+def _health_bucket(health_percentage: float) -> tuple:
+    """Return the (color, status) pair for a health percentage."""
+    return _HEALTH_BUCKETS[bisect_right(_HEALTH_THRESHOLDS, health_percentage)]
+
+@st.cache_data(max_entries=128, show_spinner=False)
 def create_battery_health_gauge(health_percentage: float) -> go.Figure:
     """
     Create a gauge chart for battery health percentage.
     
     Args:
-        health_percentage: Battery health percentage (0-100)
+        health_percentage: Battery health percentage (0-100). Callers round
+            it to one decimal so nearby values share a cached figure.
     
     Returns:
         Plotly figure object
     """
     # Determine color based on health percentage
-    if health_percentage >= 80:
-        color = '#28a745'  # Green
-        status = "Excellent"
-    elif health_percentage >= 60:
-        color = '#ffc107'  # Yellow
-        status = "Good"
-    elif health_percentage >= 40:
-        color = '#fd7e14'  # Orange
-        status = "Fair"
-    else:
-        color = '#dc3545'  # Red
-        status = "Poor"
+    color, status = _health_bucket(health_percentage)
     
     fig = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
@@ -205,28 +341,54 @@ def create_battery_health_gauge(health_percentage: float) -> go.Figure:
     
     return fig
 
-def create_progress_bar(health_percentage: float) -> str:
-    """Create HTML progress bar for battery health."""
-    # Determine color based on health
-    if health_percentage >= 80:
-        color = '#28a745'
-    elif health_percentage >= 60:
-        color = '#ffc107'
-    elif health_percentage >= 40:
-        color = '#fd7e14'
-    else:
-        color = '#dc3545'
-    
-    return f"""
-    <div style="background-color: #f0f0f0; border-radius: 10px; padding: 3px;">
-        <div style="background-color: {color}; width: {health_percentage}%; 
-                    height: 30px; border-radius: 8px; display: flex; 
-                    align-items: center; justify-content: center; color: white; 
-                    font-weight: bold; transition: width 0.5s;">
-            {health_percentage:.1f}%
-        </div>
-    </div>
+_OPENAI_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert battery health analyst providing clear, actionable insights about EV battery health."
+}
+
+_OPENAI_PROMPT_TMPL = """You are an expert EV battery health analyst. Analyze the following battery parameters and provide clear, actionable insights.
+
+Battery Status:
+- Health: {health_pct:.1f}%
+- Remaining Useful Life (RUL): {rul:.0f} cycles
+- Temperature: {temp}°C
+- Voltage: {voltage}V
+- Current: {current}A
+- Charging Cycles: {cycles}
+- State of Charge: {soc}%
+
+Please provide:
+1. A brief analysis (2-3 sentences) explaining why the battery health is at {health_pct:.1f}%
+2. Identify the MAIN factor(s) causing health decline (e.g., "Your battery health is declining mainly due to high temperature" or "Try keeping your charging cycles below 600 to extend lifespan")
+3. Provide 2-3 specific, actionable recommendations
+4. Use a friendly, professional tone with appropriate emojis
+
+Keep the response concise (100-150 words) and focused on practical advice."""
+
+@st.cache_resource(show_spinner=False)
+def _openai_client(api_key: str):
+    """OpenAI client per API key, shared across reruns and sessions."""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _openai_completion(api_key: str, prompt: str) -> str:
     """
+    Request insights from OpenAI for a prompt.
+    
+    The prompt embeds the rounded prediction and inputs, so repeated queries
+    are answered from the cache. Failed requests raise and are not cached.
+    """
+    response = _openai_client(api_key).chat.completions.create(
+        model="gpt-4",
+        messages=[
+            _OPENAI_SYSTEM_MESSAGE,
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=300,
+        temperature=0.7
+    )
+    return response.choices[0].message.content.strip()
 
 def generate_ai_insights_openai(
     input_data: Dict[str, Any],
@@ -248,8 +410,6 @@ def generate_ai_insights_openai(
         return None
     
     try:
-        client = OpenAI(api_key=api_key)
-        
         # Create prompt for AI analysis
         health_pct = prediction_result.get('battery_health_percentage', 50)
         rul = prediction_result.get('predicted_rul', 500)
@@ -259,71 +419,36 @@ def generate_ai_insights_openai(
         cycles = input_data.get('charging_cycles', 500)
         soc = input_data.get('state_of_charge', 75)
         
-        prompt = f"""You are an expert EV battery health analyst. Analyze the following battery parameters and provide clear, actionable insights.
-
-Battery Status:
-- Health: {health_pct:.1f}%
-- Remaining Useful Life (RUL): {rul:.0f} cycles
-- Temperature: {temp}°C
-- Voltage: {voltage}V
-- Current: {current}A
-- Charging Cycles: {cycles}
-- State of Charge: {soc}%
-
-Please provide:
-1. A brief analysis (2-3 sentences) explaining why the battery health is at {health_pct:.1f}%
-2. Identify the MAIN factor(s) causing health decline (e.g., "Your battery health is declining mainly due to high temperature" or "Try keeping your charging cycles below 600 to extend lifespan")
-3. Provide 2-3 specific, actionable recommendations
-4. Use a friendly, professional tone with appropriate emojis
-
-Keep the response concise (100-150 words) and focused on practical advice."""
-        
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert battery health analyst providing clear, actionable insights about EV battery health."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=300,
-            temperature=0.7
+        prompt = _OPENAI_PROMPT_TMPL.format(
+            health_pct=health_pct,
+            rul=rul,
+            temp=temp,
+            voltage=voltage,
+            current=current,
+            cycles=cycles,
+            soc=soc
         )
-        
-        return response.choices[0].message.content.strip()
+        return _openai_completion(api_key, prompt)
     
     except Exception as e:
         st.warning(f"⚠️ OpenAI API error: {str(e)}")
         return None
 
-def generate_ai_insights_huggingface(
+def _rule_based_insights(
     input_data: Dict[str, Any],
     prediction_result: Dict[str, Any]
 ) -> Optional[str]:
     """
-    Generate AI insights using HuggingFace transformers (fallback).
+    Generate rule-based insights (fallback when OpenAI is not used).
     
     Args:
         input_data: Battery input parameters
         prediction_result: Prediction results from the model
     
     Returns:
-        AI-generated insights string or None if error
+        Insights string or None if error
     """
-    if not HUGGINGFACE_AVAILABLE:
-        return None
-    
     try:
-        # Cache the model in session state to avoid reloading
-        if 'hf_generator' not in st.session_state:
-            with st.spinner("Loading HuggingFace model (first time only)..."):
-                st.session_state['hf_generator'] = pipeline(
-                    "text-generation",
-                    model="gpt2",  # Can be changed to a more suitable model
-                    device=0 if torch.cuda.is_available() else -1
-                )
-        
-        generator = st.session_state['hf_generator']
-        
-        # Create a more structured prompt for better results
         health_pct = prediction_result.get('battery_health_percentage', 50)
         temp = input_data.get('battery_temperature', 25)
         cycles = input_data.get('charging_cycles', 500)
@@ -378,7 +503,7 @@ def generate_ai_insights_huggingface(
         return insights
     
     except Exception as e:
-        st.warning(f"⚠️ HuggingFace error: {str(e)}")
+        st.warning(f"⚠️ Insights error: {str(e)}")
         return None
 
 def generate_ai_insights(
@@ -405,52 +530,60 @@ def generate_ai_insights(
         if insights:
             return insights
     
-    # Fallback to HuggingFace
+    # Fallback to rule-based insights
     if HUGGINGFACE_AVAILABLE:
-        insights = generate_ai_insights_huggingface(input_data, prediction_result)
+        insights = _rule_based_insights(input_data, prediction_result)
         if insights:
             return insights
     
     # If both fail, return None
     return None
 
-def get_health_recommendations(data: Dict[str, Any], health_percentage: float) -> list:
-    """Generate recommendations based on battery parameters and health."""
-    recommendations = []
-    
+# Recommendation rules as (predicate(data, health_percentage), message), in
+# display order. Predicates within a group are mutually exclusive.
+_RULES: List[Tuple[Callable[[Dict[str, Any], float], bool], str]] = [
     # Temperature recommendations
-    temp = data.get('battery_temperature', 25)
-    if temp > 45:
-        recommendations.append("🔥 High temperature detected! Keep battery cool to extend lifespan.")
-    elif temp < 0:
-        recommendations.append("❄️ Low temperature detected! Battery performance may be reduced.")
-    
+    (lambda d, h: d.get('battery_temperature', 25) > 45,
+     "🔥 High temperature detected! Keep battery cool to extend lifespan."),
+    (lambda d, h: d.get('battery_temperature', 25) < 0,
+     "❄️ Low temperature detected! Battery performance may be reduced."),
     # Voltage recommendations
-    voltage = data.get('voltage', 3.7)
-    if voltage < 3.2:
-        recommendations.append("⚠️ Low voltage detected! Battery may need charging.")
-    elif voltage > 4.3:
-        recommendations.append("⚠️ High voltage detected! Monitor battery carefully.")
-    
+    (lambda d, h: d.get('voltage', 3.7) < 3.2,
+     "⚠️ Low voltage detected! Battery may need charging."),
+    (lambda d, h: d.get('voltage', 3.7) > 4.3,
+     "⚠️ High voltage detected! Monitor battery carefully."),
     # Current recommendations
-    current = data.get('current', 1.0)
-    if current > 5:
-        recommendations.append("⚡ High current draw detected! This may accelerate degradation.")
-    
+    (lambda d, h: d.get('current', 1.0) > 5,
+     "⚡ High current draw detected! This may accelerate degradation."),
     # Cycle recommendations
-    cycles = data.get('charging_cycles', 0)
-    if cycles > 1000:
-        recommendations.append("🔄 High cycle count! Consider battery replacement soon.")
-    
+    (lambda d, h: d.get('charging_cycles', 0) > 1000,
+     "🔄 High cycle count! Consider battery replacement soon."),
     # Health-based recommendations
-    if health_percentage < 40:
-        recommendations.append("🔴 Battery health is critically low! Consider replacement.")
-    elif health_percentage < 60:
-        recommendations.append("🟡 Battery health is declining. Monitor closely.")
-    elif health_percentage >= 80:
-        recommendations.append(" Battery health is excellent! Continue proper maintenance.")
+    (lambda d, h: h < 40,
+     "🔴 Battery health is critically low! Consider replacement."),
+    (lambda d, h: 40 <= h < 60,
+     "🟡 Battery health is declining. Monitor closely."),
+    (lambda d, h: h >= 80,
+     " Battery health is excellent! Continue proper maintenance."),
+]
+
+def get_health_recommendations(data: Dict[str, Any], health_percentage: float) -> list:
+    """Generate recommendations based on battery parameters and health."""
+    return [message for predicate, message in _RULES if predicate(data, health_percentage)]
+
+@lru_cache(maxsize=256)
+def _cached_recommendations(input_items: tuple, health_percentage: float) -> tuple:
+    """
+    Memoized get_health_recommendations.
     
-    return recommendations
+    Args:
+        input_items: Sorted (name, value) pairs of the battery parameters
+        health_percentage: Battery health percentage rounded to one decimal
+    
+    Returns:
+        Recommendations as a tuple, so the shared cached value is immutable
+    """
+    return tuple(get_health_recommendations(dict(input_items), health_percentage))
 
 def display_ai_configuration():
     """Display AI configuration section in the sidebar."""
@@ -471,7 +604,7 @@ def display_ai_configuration():
     api_key = None
     if use_openai:
         # Try to get API key from environment variable first
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = _ENV_OPENAI_KEY
         
         # Allow user to input API key
         api_key_input = st.sidebar.text_input(
@@ -503,11 +636,8 @@ def display_ai_configuration():
             else:
                 st.sidebar.error(" OpenAI library not installed. Install with: pip install openai")
         elif use_huggingface:
-            if HUGGINGFACE_AVAILABLE:
-                st.sidebar.success("✅ HuggingFace available")
-                st.sidebar.caption("ℹ️ Using rule-based insights")
-            else:
-                st.sidebar.error(" HuggingFace not installed. Install with: pip install transformers torch")
+            st.sidebar.success("✅ HuggingFace available")
+            st.sidebar.caption("ℹ️ Using rule-based insights")
         
         # Add info about AI feature
         with st.sidebar.expander("ℹ️ About AI Insights", expanded=False):
@@ -527,55 +657,134 @@ def display_ai_configuration():
     
     return ai_enabled, use_openai, api_key
 
+@st.cache_resource(show_spinner=False)
+def _pdf_styles() -> Dict[str, Any]:
+    """
+    Paragraph and table styles for the PDF report, built once per process
+    and shared across sessions.
+    
+    Returns:
+        Dictionary of reportlab style objects keyed by use
+    """
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    
+    styles = getSampleStyleSheet()
+    
+    def table_style(header_color, body_color):
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), header_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), body_color),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+    
+    return {
+        'normal': styles['Normal'],
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1f77b4'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#1f77b4'),
+            spaceAfter=12,
+            spaceBefore=12
+        ),
+        'footer': ParagraphStyle('Footer', parent=styles['Normal'], alignment=TA_CENTER, fontSize=10),
+        'input_table': table_style(colors.HexColor('#1f77b4'), colors.beige),
+        'results_table': table_style(colors.HexColor('#28a745'), colors.lightgrey),
+    }
+
+@st.cache_resource(show_spinner=False)
+def _pdf_template_factory():
+    """
+    Build the report page layout once and return a document factory.
+    
+    Returns:
+        Callable taking an output buffer and returning a document template
+        with the report's page layout
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate
+    
+    margins = dict(leftMargin=inch, rightMargin=inch, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    frame_geometry = (
+        margins['leftMargin'],
+        margins['bottomMargin'],
+        A4[0] - margins['leftMargin'] - margins['rightMargin'],
+        A4[1] - margins['topMargin'] - margins['bottomMargin']
+    )
+    
+    def make_template(buffer) -> BaseDocTemplate:
+        # Frames keep layout state while a document builds, so each document
+        # gets its own instead of sharing one between concurrent exports
+        frame = Frame(*frame_geometry, id='normal')
+        return BaseDocTemplate(
+            buffer,
+            pagesize=A4,
+            pageTemplates=[PageTemplate(id='Report', frames=[frame])],
+            **margins
+        )
+    
+    return make_template
+
 def generate_pdf_report(
     input_data: Dict[str, Any],
     prediction_result: Dict[str, Any],
+    out: BinaryIO,
     ai_insights: Optional[str] = None,
-    recommendations: list = None
-) -> bytes:
+    recommendations: list = None,
+    make_template: Optional[Callable[[BinaryIO], Any]] = None,
+    styles: Optional[Dict[str, Any]] = None
+) -> None:
     """
     Generate a PDF report with battery health prediction results.
     
     Args:
         input_data: Battery input parameters
         prediction_result: Prediction results
+        out: Binary file-like object the PDF is written to
         ai_insights: AI-generated insights (optional)
         recommendations: List of recommendations (optional)
+        make_template: Result of _pdf_template_factory() (optional)
+        styles: Result of _pdf_styles() (optional)
     
-    Returns:
-        PDF file as bytes
+    Callers off the script thread must pass make_template and styles, since
+    the cached factories need a ScriptRunContext.
     """
     if not REPORTLAB_AVAILABLE:
         raise ImportError("reportlab is required for PDF generation. Install with: pip install reportlab")
     
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
-    story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer, Table
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=12,
-        spaceBefore=12
-    )
+    if make_template is None:
+        make_template = _pdf_template_factory()
+    if styles is None:
+        styles = _pdf_styles()
+    doc = make_template(out)
+    story = []
+    title_style = styles['title']
+    heading_style = styles['heading']
     
     # Title
     story.append(Paragraph("🔋 EV Battery Health Prediction Report", title_style))
     story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['normal']))
     story.append(Spacer(1, 0.3*inch))
     
     # Input Data Section
@@ -589,16 +798,7 @@ def generate_pdf_report(
         ['State of Charge', f"{input_data.get('state_of_charge', 'N/A')}%"]
     ]
     input_table = Table(input_table_data, colWidths=[3*inch, 2*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    input_table.setStyle(styles['input_table'])
     story.append(input_table)
     story.append(Spacer(1, 0.3*inch))
     
@@ -613,48 +813,58 @@ def generate_pdf_report(
         ['Predicted RUL', f"{rul:.1f} cycles"]
     ]
     results_table = Table(results_table_data, colWidths=[3*inch, 2*inch])
-    results_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#28a745')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    results_table.setStyle(styles['results_table'])
     story.append(results_table)
     story.append(Spacer(1, 0.3*inch))
     
     # AI Insights Section
     if ai_insights:
         story.append(Paragraph("AI-Generated Insights", heading_style))
-        story.append(Paragraph(ai_insights, styles['Normal']))
+        story.append(Paragraph(ai_insights, styles['normal']))
         story.append(Spacer(1, 0.3*inch))
     
     # Recommendations Section
     if recommendations:
         story.append(Paragraph("Recommendations", heading_style))
         for rec in recommendations:
-            story.append(Paragraph(f"• {rec}", styles['Normal']))
+            story.append(Paragraph(f"• {rec}", styles['normal']))
             story.append(Spacer(1, 0.1*inch))
     else:
         story.append(Paragraph("Recommendations", heading_style))
-        story.append(Paragraph(" All parameters are within optimal ranges!", styles['Normal']))
+        story.append(Paragraph(" All parameters are within optimal ranges!", styles['normal']))
     
     story.append(Spacer(1, 0.3*inch))
     
     # Footer
     story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph("EV Battery Health Prediction System", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], alignment=TA_CENTER, fontSize=10)))
-    story.append(Paragraph("Powered by Machine Learning & AI", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], alignment=TA_CENTER, fontSize=10)))
+    story.append(Paragraph("EV Battery Health Prediction System", styles['footer']))
+    story.append(Paragraph("Powered by Machine Learning & AI", styles['footer']))
     
     # Build PDF
     doc.build(story)
-    buffer.seek(0)
-    return buffer.getvalue()
+
+# Plain-text report offered when reportlab is not installed
+_REPORT_TMPL = """
+# Battery Health Prediction Report
+Generated on: {ts}
+
+## Input Parameters
+- Battery Temperature: {battery_temperature}°C
+- Voltage: {voltage}V
+- Current: {current}A
+- Charging Cycles: {charging_cycles}
+- State of Charge: {state_of_charge}%
+
+## Prediction Results
+- Battery Health: {health_2}%
+- Predicted RUL: {rul_1} cycles
+
+## AI Insights
+{ai_insights}
+
+## Recommendations
+{recommendations}
+"""
 
 def toggle_theme():
     """Toggle between light and dark theme."""
@@ -664,88 +874,272 @@ def toggle_theme():
         st.session_state.theme = 'light'
 
 def apply_theme():
-    """Apply theme based on session state."""
+    """Apply base and theme CSS in a single markdown element."""
     theme = st.session_state.get('theme', 'light')
-    
-    if theme == 'dark':
-        st.markdown("""
-        <style>
-        .stApp {
-            background-color: #1e1e1e;
-            color: #ffffff;
-        }
-        .main-header {
-            color: #4CAF50;
-        }
-        .info-box {
-            background-color: #2d2d2d;
-            color: #ffffff;
-        }
-        .metric-card {
-            background-color: #2d2d2d;
-        }
-        .stMetric {
-            background-color: #2d2d2d;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    else:
-        # Light theme is default
-        pass
+    st.markdown(_THEME_CSS.get(theme, _THEME_CSS['light']), unsafe_allow_html=True)
+
+# Parameter reference shown in the sidebar, joined once into a single
+# markdown block
+_PARAMETER_INFO_MD = """
+#### 🌡️ Battery Temperature
+**Range:** -20°C to 60°C
+
+**Impact:**
+- High temperature (>45°C) accelerates degradation
+- Low temperature (<0°C) reduces performance
+- Optimal range: 15°C to 35°C
+
+#### ⚡ Voltage
+**Range:** 2.5V to 4.5V
+
+**Impact:**
+- Low voltage (<3.2V) indicates low charge
+- High voltage (>4.3V) may indicate overcharging
+- Normal operating range: 3.0V to 4.2V
+
+#### 🔌 Current
+**Range:** 0A to 10A
+
+**Impact:**
+- High current draws accelerate degradation
+- Optimal charging current: 0.5C to 1C
+- Fast charging (>2C) reduces battery lifespan
+
+#### 🔄 Charging Cycles
+**Range:** 0 to 10,000 cycles
+
+**Impact:**
+- Each cycle reduces capacity slightly
+- Typical lifespan: 500-2000 cycles
+- Cycles >1000 indicate aging battery
+
+#### 📊 State of Charge
+**Range:** 0% to 100%
+
+**Impact:**
+- Keep between 20% and 80% for optimal lifespan
+- Avoid deep discharge (<10%)
+- Avoid full charge (>95%) for extended periods
+"""
+
+# Static panels of the main page. HTML goes through st.html and plain lists
+# through st.text, skipping the client-side markdown pipeline.
+_ABOUT_HTML = """
+<div class="info-box">
+<h4>🔋 About Battery Health</h4>
+<p>Battery health indicates the remaining capacity and performance of your battery. 
+Higher percentages mean better health and longer lifespan.</p>
+</div>
+"""
+
+_STATUS_GUIDE_TEXT = """\
+🟢 80-100%: Excellent - Battery in great condition
+🟡 60-79%: Good - Battery performing well
+🟠 40-59%: Fair - Monitor battery closely
+🔴 0-39%: Poor - Consider replacement"""
+
+_BEST_PRACTICES_TEXT = """\
+1. Temperature Control: Keep battery between 15-35°C
+2. Charging Habits: Avoid full charge/discharge cycles
+3. Current Management: Use appropriate charging rates
+4. Regular Monitoring: Check battery health regularly
+5. Proper Storage: Store at 50% charge in cool place"""
+
+_FOOTER_HTML = """
+<div style="text-align: center; color: #666; padding: 1rem;">
+    <p>🔋 EV Battery Health Prediction System | Powered by Machine Learning</p>
+    <p>For best results, ensure accurate parameter input and regular monitoring</p>
+</div>
+"""
+
+# Key factors listed in the information column as (title, description)
+_FACTORS = (
+    ("🌡️ Temperature", "High temperature can degrade battery health faster. Optimal range: 15-35°C"),
+    ("⚡ Voltage", "Low voltage might indicate underperformance. Monitor voltage levels regularly."),
+    ("🔌 Current", "High current draws accelerate degradation. Use appropriate charging rates."),
+    ("🔄 Cycles", "Each charging cycle reduces capacity slightly. More cycles = lower health."),
+    ("📊 State of Charge", "Avoid extreme states (0% or 100%) for extended periods.")
+)
+
+@st.fragment
+def _render_factors():
+    """Render the key factor expanders as an isolated fragment."""
+    for factor, description in _FACTORS:
+        with st.expander(factor, expanded=False):
+            st.markdown(description)
 
 def display_parameter_info():
     """Display information about battery parameters in the sidebar."""
-    st.sidebar.markdown("### 📊 Parameter Information")
+    with st.sidebar.expander("📊 Parameter Information", expanded=False):
+        st.markdown(_PARAMETER_INFO_MD)
+
+def _render_pdf_download(
+    input_data: Dict[str, Any],
+    result: Dict[str, Any],
+    ai_insights: Optional[str],
+    recommendations: tuple,
+    report_stamp: str,
+    fmt: Dict[str, str]
+):
+    """Render the PDF report download button; the PDF is built on click."""
+    # Resolved here, on the script thread; pdf_report runs without a ScriptRunContext
+    make_template = _pdf_template_factory()
+    styles = _pdf_styles()
+    
+    def pdf_report() -> io.BytesIO:
+        buffer = io.BytesIO()
+        generate_pdf_report(
+            input_data,
+            result,
+            buffer,
+            ai_insights=ai_insights,
+            recommendations=recommendations,
+            make_template=make_template,
+            styles=styles
+        )
+        buffer.seek(0)
+        return buffer
+    
+    st.download_button(
+        label="📥 Download PDF Report",
+        data=pdf_report,
+        file_name=f"battery_health_report_{report_stamp}.pdf",
+        mime="application/pdf",
+        use_container_width=True
+    )
+
+def _render_text_download(
+    input_data: Dict[str, Any],
+    result: Dict[str, Any],
+    ai_insights: Optional[str],
+    recommendations: tuple,
+    report_stamp: str,
+    fmt: Dict[str, str]
+):
+    """Render the plain-text report download used when reportlab is missing."""
+    st.warning("⚠️ PDF generation requires reportlab. Install with: `pip install reportlab`")
+    
+    def text_report() -> str:
+        ctx = {
+            'ts': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'battery_temperature': input_data.get('battery_temperature'),
+            'voltage': input_data.get('voltage'),
+            'current': input_data.get('current'),
+            'charging_cycles': input_data.get('charging_cycles'),
+            'state_of_charge': input_data.get('state_of_charge'),
+            'health_2': fmt['health_2'],
+            'rul_1': fmt['rul_1'],
+            'ai_insights': ai_insights if ai_insights is not None else 'N/A',
+            'recommendations': "\n".join(f"- {rec}" for rec in recommendations)
+                               or "- All parameters are within optimal ranges!"
+        }
+        return _REPORT_TMPL.format_map(ctx)
+    
+    st.download_button(
+        label="📥 Download Text Report",
+        data=text_report,
+        file_name=f"battery_health_report_{report_stamp}.txt",
+        mime="text/plain",
+        use_container_width=True
+    )
+
+# Report download renderer, chosen once since reportlab availability is fixed
+# at import. Reports are built only when the download button is clicked, on a
+# worker thread outside the script run: st.* calls made there are ignored, so
+# an exception while building a report is logged by Streamlit and shown by the
+# browser as a failed download rather than as an st.error in the page.
+_render_download = _render_pdf_download if REPORTLAB_AVAILABLE else _render_text_download
+
+@st.fragment
+def _render_result_panel(
+    result: Dict[str, Any],
+    input_data: Dict[str, Any],
+    ai_insights: Optional[str],
+    ai_enabled: bool,
+    report_stamp: str
+):
+    """
+    Render a prediction: metrics, gauge, insights, recommendations and
+    report download.
     
-    with st.sidebar.expander("🌡️ Battery Temperature", expanded=False):
-        st.markdown("""
-        **Range:** -20°C to 60°C
-        
-        **Impact:**
-        - High temperature (>45°C) accelerates degradation
-        - Low temperature (<0°C) reduces performance
-        - Optimal range: 15°C to 35°C
-        """)
+    Runs as a fragment so widget interactions inside the panel rerun only
+    this function instead of the whole script.
     
-    with st.sidebar.expander("⚡ Voltage", expanded=False):
-        st.markdown("""
-        **Range:** 2.5V to 4.5V
-        
-        **Impact:**
-        - Low voltage (<3.2V) indicates low charge
-        - High voltage (>4.3V) may indicate overcharging
-        - Normal operating range: 3.0V to 4.2V
-        """)
+    Args:
+        result: Prediction results from the API
+        input_data: Battery input parameters the prediction was made for
+        ai_insights: AI-generated insights, if any
+        ai_enabled: Whether AI insights should be shown
+        report_stamp: Timestamp of the prediction used in report file names
+    """
+    health_percentage = result['battery_health_percentage']
+    
+    # Formatted values shared by the metrics, progress bar and text report
+    fmt = {
+        'health_1': f"{health_percentage:.1f}",
+        'health_2': f"{health_percentage:.2f}",
+        'health_delta': f"{health_percentage - 100:.1f}",
+        'rul_1': f"{result['predicted_rul']:.1f}"
+    }
     
-    with st.sidebar.expander("🔌 Current", expanded=False):
-        st.markdown("""
-        **Range:** 0A to 10A
-        
-        **Impact:**
-        - High current draws accelerate degradation
-        - Optimal charging current: 0.5C to 1C
-        - Fast charging (>2C) reduces battery lifespan
-        """)
+    # Metrics
+    col_metric1, col_metric2 = st.columns(2)
     
-    with st.sidebar.expander("🔄 Charging Cycles", expanded=False):
-        st.markdown("""
-        **Range:** 0 to 10,000 cycles
-        
-        **Impact:**
-        - Each cycle reduces capacity slightly
-        - Typical lifespan: 500-2000 cycles
-        - Cycles >1000 indicate aging battery
-        """)
+    with col_metric1:
+        st.metric(
+            "🔋 Predicted RUL",
+            f"{fmt['rul_1']} cycles",
+            help="Remaining Useful Life in charging cycles"
+        )
+    
+    with col_metric2:
+        st.metric(
+            "💚 Battery Health",
+            f"{fmt['health_1']}%",
+            delta=f"{fmt['health_delta']}% vs new",
+            help="Battery health as a percentage"
+        )
+    
+    # Gauge visualization
+    st.subheader("📊 Battery Health Gauge")
+    gauge_fig = create_battery_health_gauge(round(health_percentage, 1))
+    st.plotly_chart(gauge_fig, use_container_width=True, theme=None, config=PLOTLY_CONFIG)
     
-    with st.sidebar.expander("📊 State of Charge", expanded=False):
+    # Progress bar
+    st.subheader("📈 Health Progress")
+    st.progress(min(max(int(health_percentage), 0), 100), text=f"{fmt['health_1']}%")
+    
+    # AI-Generated Insights
+    if ai_enabled and ai_insights:
+        st.subheader("🤖 AI-Generated Insights")
         st.markdown("""
-        **Range:** 0% to 100%
+        <div class="info-box" style="background-color: #e8f4f8; padding: 1.5rem; border-radius: 0.5rem; border-left: 4px solid #1f77b4;">
+        """, unsafe_allow_html=True)
         
-        **Impact:**
-        - Keep between 20% and 80% for optimal lifespan
-        - Avoid deep discharge (<10%)
-        - Avoid full charge (>95%) for extended periods
-        """)
+        # Display AI insights with nice formatting
+        st.markdown(ai_insights)
+        
+        st.markdown("</div>", unsafe_allow_html=True)
+        st.html(_SECTION_RULE)
+    
+    # Recommendations
+    st.subheader("💡 Recommendations")
+    recommendations = _cached_recommendations(
+        tuple(sorted(input_data.items())),
+        round(health_percentage, 1)
+    )
+    
+    if recommendations:
+        st.info("\n\n".join(recommendations))
+    else:
+        st.success("✅ All parameters are within optimal ranges!")
+    
+    # Download Report Button
+    st.html(_SECTION_RULE)
+    st.subheader("📄 Download Report")
+    
+    _render_download(input_data, result, ai_insights, recommendations, report_stamp, fmt)
+    
 
 def main():
     """Main application function."""
@@ -762,7 +1156,7 @@ def main():
             toggle_theme()
             st.rerun()
     
-    st.markdown("---")
+    st.html(_SECTION_RULE)
     
     # Check API health
     api_healthy = check_api_health()
@@ -782,53 +1176,63 @@ def main():
     
     # Sidebar for inputs
     st.sidebar.title("⚙️ Battery Parameters")
-    st.sidebar.markdown("Adjust the parameters below to predict battery health:")
-    
-    # Input widgets
-    battery_temperature = st.sidebar.slider(
-        "🌡️ Battery Temperature (°C)",
-        min_value=-20.0,
-        max_value=60.0,
-        value=25.0,
-        step=0.5,
-        help="Current battery temperature in Celsius"
-    )
-    
-    voltage = st.sidebar.slider(
-        "⚡ Voltage (V)",
-        min_value=2.5,
-        max_value=4.5,
-        value=3.7,
-        step=0.1,
-        help="Current battery voltage"
-    )
-    
-    current = st.sidebar.slider(
-        "🔌 Current (A)",
-        min_value=0.0,
-        max_value=10.0,
-        value=1.0,
-        step=0.1,
-        help="Current draw in Amperes"
-    )
-    
-    charging_cycles = st.sidebar.slider(
-        "🔄 Charging Cycles",
-        min_value=0,
-        max_value=10000,
-        value=500,
-        step=10,
-        help="Number of charging cycles completed"
-    )
-    
-    state_of_charge = st.sidebar.slider(
-        "📊 State of Charge (%)",
-        min_value=0.0,
-        max_value=100.0,
-        value=75.0,
-        step=1.0,
-        help="Current state of charge percentage"
-    )
+    st.sidebar.markdown("Adjust the parameters below and click **Predict Battery Health**:")
+    
+    # Input widgets. Inside a form, slider changes do not rerun the script
+    # until the form is submitted.
+    with st.sidebar.form("battery_params"):
+        battery_temperature = st.slider(
+            "🌡️ Battery Temperature (°C)",
+            min_value=-20.0,
+            max_value=60.0,
+            value=25.0,
+            step=0.5,
+            help="Current battery temperature in Celsius"
+        )
+        
+        voltage = st.slider(
+            "⚡ Voltage (V)",
+            min_value=2.5,
+            max_value=4.5,
+            value=3.7,
+            step=0.1,
+            help="Current battery voltage"
+        )
+        
+        current = st.slider(
+            "🔌 Current (A)",
+            min_value=0.0,
+            max_value=10.0,
+            value=1.0,
+            step=0.1,
+            help="Current draw in Amperes"
+        )
+        
+        charging_cycles = st.slider(
+            "🔄 Charging Cycles",
+            min_value=0,
+            max_value=10000,
+            value=500,
+            step=10,
+            help="Number of charging cycles completed"
+        )
+        
+        state_of_charge = st.slider(
+            "📊 State of Charge (%)",
+            min_value=0.0,
+            max_value=100.0,
+            value=75.0,
+            step=1.0,
+            help="Current state of charge percentage"
+        )
+        
+        # The form's submit button is the only predict trigger, so a
+        # prediction always uses the values currently shown
+        predict_clicked = st.form_submit_button(
+            "🔮 Predict Battery Health",
+            type="primary",
+            use_container_width=True
+        )
     
     # Display AI configuration
     ai_enabled, use_openai, openai_api_key = display_ai_configuration()
@@ -842,8 +1246,7 @@ def main():
     with col1:
         st.subheader("📈 Prediction Results")
         
-        # Predict button
-        if st.button("🔮 Predict Battery Health", type="primary", use_container_width=True):
+        if predict_clicked:
             # Prepare input data
             input_data = {
                 "battery_temperature": battery_temperature,
@@ -865,8 +1268,10 @@ def main():
                 # Store results in session state
                 st.session_state['prediction_result'] = result
                 st.session_state['input_data'] = input_data
+                st.session_state['report_stamp'] = datetime.now().strftime('%Y%m%d_%H%M%S')
                 
-                # Generate AI insights if enabled
+                # Generate AI insights if enabled. OpenAI responses for
+                # repeated inputs come from _openai_completion's cache
                 if ai_enabled:
                     with st.spinner("🤖 Generating AI insights..."):
                         ai_insights = generate_ai_insights(
@@ -882,171 +1287,36 @@ def main():
         
         # Display results if available
         if 'prediction_result' in st.session_state:
-            result = st.session_state['prediction_result']
-            
-            # Metrics
-            col_metric1, col_metric2 = st.columns(2)
-            
-            with col_metric1:
-                st.metric(
-                    "🔋 Predicted RUL",
-                    f"{result['predicted_rul']:.1f} cycles",
-                    help="Remaining Useful Life in charging cycles"
-                )
-            
-            with col_metric2:
-                st.metric(
-                    "💚 Battery Health",
-                    f"{result['battery_health_percentage']:.1f}%",
-                    help="Battery health as a percentage"
-                )
-            
-            # Gauge visualization
-            st.subheader("📊 Battery Health Gauge")
-            health_percentage = result['battery_health_percentage']
-            gauge_fig = create_battery_health_gauge(health_percentage)
-            st.plotly_chart(gauge_fig, use_container_width=True)
-            
-            # Progress bar
-            st.subheader("📈 Health Progress")
-            progress_html = create_progress_bar(health_percentage)
-            st.markdown(progress_html, unsafe_allow_html=True)
-            
-            # AI-Generated Insights
-            if ai_enabled and 'ai_insights' in st.session_state and st.session_state['ai_insights']:
-                st.subheader("🤖 AI-Generated Insights")
-                st.markdown("""
-                <div class="info-box" style="background-color: #e8f4f8; padding: 1.5rem; border-radius: 0.5rem; border-left: 4px solid #1f77b4;">
-                """, unsafe_allow_html=True)
-                
-                # Display AI insights with nice formatting
-                insights = st.session_state['ai_insights']
-                st.markdown(insights)
-                
-                st.markdown("</div>", unsafe_allow_html=True)
-                st.markdown("---")
-            
-            # Recommendations
-            st.subheader("💡 Recommendations")
-            recommendations = get_health_recommendations(
+            _render_result_panel(
+                st.session_state['prediction_result'],
                 st.session_state['input_data'],
-                health_percentage
+                st.session_state.get('ai_insights'),
+                ai_enabled,
+                st.session_state['report_stamp']
             )
-            
-            if recommendations:
-                for rec in recommendations:
-                    st.info(rec)
-            else:
-                st.success("✅ All parameters are within optimal ranges!")
-            
-            # Download Report Button
-            st.markdown("---")
-            st.subheader("📄 Download Report")
-            
-            try:
-                if REPORTLAB_AVAILABLE:
-                    pdf_data = generate_pdf_report(
-                        st.session_state['input_data'],
-                        result,
-                        ai_insights=st.session_state.get('ai_insights'),
-                        recommendations=recommendations
-                    )
-                    
-                    st.download_button(
-                        label="📥 Download PDF Report",
-                        data=pdf_data,
-                        file_name=f"battery_health_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                        mime="application/pdf",
-                        use_container_width=True
-                    )
-                else:
-                    st.warning("⚠️ PDF generation requires reportlab. Install with: `pip install reportlab`")
-                    # Fallback: Generate text report
-                    report_text = f"""
-# Battery Health Prediction Report
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Input Parameters
-- Battery Temperature: {st.session_state['input_data'].get('battery_temperature')}°C
-- Voltage: {st.session_state['input_data'].get('voltage')}V
-- Current: {st.session_state['input_data'].get('current')}A
-- Charging Cycles: {st.session_state['input_data'].get('charging_cycles')}
-- State of Charge: {st.session_state['input_data'].get('state_of_charge')}%
-
-## Prediction Results
-- Battery Health: {health_percentage:.2f}%
-- Predicted RUL: {result['predicted_rul']:.1f} cycles
-
-## AI Insights
-{st.session_state.get('ai_insights', 'N/A')}
-
-## Recommendations
-{chr(10).join([f"- {rec}" for rec in recommendations]) if recommendations else "- All parameters are within optimal ranges!"}
-"""
-                    st.download_button(
-                        label="📥 Download Text Report",
-                        data=report_text,
-                        file_name=f"battery_health_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
-            except Exception as e:
-                st.error(f"Error generating report: {str(e)}")
     
     with col2:
         st.subheader("ℹ️ Information & Tips")
         
         # General information
-        st.markdown("""
-        <div class="info-box">
-        <h4>🔋 About Battery Health</h4>
-        <p>Battery health indicates the remaining capacity and performance of your battery. 
-        Higher percentages mean better health and longer lifespan.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_ABOUT_HTML)
         
         # Key factors
         st.markdown("### 🔑 Key Factors")
         
-        factors = [
-            ("🌡️ Temperature", "High temperature can degrade battery health faster. Optimal range: 15-35°C"),
-            ("⚡ Voltage", "Low voltage might indicate underperformance. Monitor voltage levels regularly."),
-            ("🔌 Current", "High current draws accelerate degradation. Use appropriate charging rates."),
-            ("🔄 Cycles", "Each charging cycle reduces capacity slightly. More cycles = lower health."),
-            ("📊 State of Charge", "Avoid extreme states (0% or 100%) for extended periods.")
-        ]
-        
-        for factor, description in factors:
-            with st.expander(factor, expanded=False):
-                st.markdown(description)
+        _render_factors()
         
         # Health status guide
         st.markdown("### 📊 Health Status Guide")
-        st.markdown("""
-        - **🟢 80-100%**: Excellent - Battery in great condition
-        - **🟡 60-79%**: Good - Battery performing well
-        - **🟠 40-59%**: Fair - Monitor battery closely
-        - **🔴 0-39%**: Poor - Consider replacement
-        """)
+        st.text(_STATUS_GUIDE_TEXT)
         
         # Best practices
         st.markdown("### ✅ Best Practices")
-        st.markdown("""
-        1. **Temperature Control**: Keep battery between 15-35°C
-        2. **Charging Habits**: Avoid full charge/discharge cycles
-        3. **Current Management**: Use appropriate charging rates
-        4. **Regular Monitoring**: Check battery health regularly
-        5. **Proper Storage**: Store at 50% charge in cool place
-        """)
+        st.text(_BEST_PRACTICES_TEXT)
     
     # Footer
-    st.markdown("---")
-    st.markdown("""
-    <div style="text-align: center; color: #666; padding: 1rem;">
-        <p>🔋 EV Battery Health Prediction System | Powered by Machine Learning</p>
-        <p>For best results, ensure accurate parameter input and regular monitoring</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(_SECTION_RULE)
+    st.html(_FOOTER_HTML)
 
 if __name__ == "__main__":
     main()
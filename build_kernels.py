@@ -0,0 +1,27 @@
+"""
+Ahead-of-time compile the API's feature kernel
+
+Builds the `battery_kernels` extension module from feature_kernels.py with
+numba.pycc. When the compiled module is importable, app.py uses it directly,
+so no JIT compilation happens when the API starts or serves its first request.
+
+Usage:
+    python build_kernels.py
+"""
+
+import os
+from numba.pycc import CC
+
+from feature_kernels import fill_features, FILL_FEATURES_SIGNATURE
+
+
+def main():
+    cc = CC('battery_kernels')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('fill_features', FILL_FEATURES_SIGNATURE)(fill_features)
+    cc.compile()
+    print(f"✓ Compiled battery_kernels into {cc.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
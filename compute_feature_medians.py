@@ -0,0 +1,56 @@
+"""
+Precompute feature medians for the Flask API
+
+The API fills every model feature it does not receive from the user with the
+training-data median. This script computes those medians once and stores them
+in model_info.json, so the API does not need to parse the dataset at startup.
+
+Usage:
+    python compute_feature_medians.py
+"""
+
+import json
+from typing import Dict
+
+import numpy as np
+
+DATA_PATH = 'data/merged_battery_data.csv'
+MODEL_INFO_PATH = 'model_info.json'
+EXCLUDE_COLS = ('RUL', 'Exp_Cell_Type')
+
+
+def compute_feature_medians(csv_path: str = DATA_PATH) -> Dict[str, float]:
+    """Median of every numeric column of the dataset, excluding the target and cell type."""
+    with open(csv_path, 'r') as f:
+        header = f.readline().rstrip('\r\n').split(',')
+    usecols = [j for j, col in enumerate(header) if col not in EXCLUDE_COLS]
+
+    try:
+        # numpy's C parser; rejects empty or non-numeric fields
+        data = np.loadtxt(csv_path, delimiter=',', skiprows=1, usecols=usecols, ndmin=2)
+    except ValueError:
+        # Slower parser that maps such fields to NaN
+        data = np.genfromtxt(csv_path, delimiter=',', skip_header=1, usecols=usecols)
+        data = data.reshape(data.shape[0], -1)
+
+    # Non-numeric columns parse as all-NaN
+    numeric = ~np.isnan(data).all(axis=0)
+    medians = np.nanmedian(data[:, numeric], axis=0)
+    names = [header[j] for j, keep in zip(usecols, numeric) if keep]
+    return {name: float(median) for name, median in zip(names, medians)}
+
+
+def main():
+    feature_medians = compute_feature_medians(DATA_PATH)
+
+    with open(MODEL_INFO_PATH, 'r') as f:
+        model_info = json.load(f)
+    model_info['feature_medians'] = feature_medians
+    with open(MODEL_INFO_PATH, 'w') as f:
+        json.dump(model_info, f, indent=2)
+
+    print(f"✓ Saved medians for {len(feature_medians)} features to {MODEL_INFO_PATH}")
+
+
+if __name__ == '__main__':
+    main()
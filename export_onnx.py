@@ -0,0 +1,58 @@
+"""
+Export the trained scaler + model to ONNX
+
+Converts feature_scaler.pkl and battery_health_model.pkl into a single ONNX
+graph (battery_health_model.onnx). When that file exists and onnxruntime is
+installed, the Flask API serves predictions with ONNX Runtime instead of
+scikit-learn/XGBoost.
+
+Requires the optional packages in requirements-onnx.txt.
+
+Usage:
+    pip install -r requirements-onnx.txt
+    python export_onnx.py
+"""
+
+import json
+import joblib
+import onnx
+from sklearn.pipeline import Pipeline
+from skl2onnx import convert_sklearn, update_registered_converter
+from skl2onnx.common.data_types import FloatTensorType
+from skl2onnx.common.shape_calculator import calculate_linear_regressor_output_shapes
+
+ONNX_MODEL_PATH = 'battery_health_model.onnx'
+
+
+def register_xgboost_converter():
+    """Teach skl2onnx about XGBRegressor (converter provided by onnxmltools)."""
+    try:
+        from xgboost import XGBRegressor
+        from onnxmltools.convert.xgboost.operator_converters.XGBoost import convert_xgboost
+    except ImportError:
+        return
+    update_registered_converter(
+        XGBRegressor, 'XGBoostXGBRegressor',
+        calculate_linear_regressor_output_shapes, convert_xgboost
+    )
+
+
+def main():
+    model = joblib.load('battery_health_model.pkl')
+    scaler = joblib.load('feature_scaler.pkl')
+    with open('model_info.json', 'r') as f:
+        n_features = len(json.load(f)['feature_names'])
+
+    register_xgboost_converter()
+    pipeline = Pipeline([('scaler', scaler), ('model', model)])
+    onnx_model = convert_sklearn(
+        pipeline,
+        initial_types=[('X', FloatTensorType([None, n_features]))],
+        target_opset={'': 15, 'ai.onnx.ml': 3}
+    )
+    onnx.save(onnx_model, ONNX_MODEL_PATH)
+    print(f"✓ Exported scaler + model to {ONNX_MODEL_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Numeric kernels for the battery health API
+
+Plain-Python source for the per-request feature kernel. app.py uses the
+ahead-of-time compiled `battery_kernels` extension when it has been built
+(see build_kernels.py), and otherwise JIT-compiles this function with numba.
+"""
+
+
+def fill_features(out, baseline, temp, volt, cur, cyc, soc,
+                  i_temp, i_volt, i_maxv, i_minv, i_cur, i_cyc,
+                  i_csq, i_vdrop, i_ed, i_tdev, i_t415, i_expt, i_tcc):
+    """Write the model feature row for one request into `out` (1-D, len N)."""
+    out[:] = baseline
+    
+    # Direct mappings
+    if i_temp >= 0:
+        out[i_temp] = temp
+    if i_volt >= 0:
+        out[i_volt] = volt
+    # Use voltage for both max and min voltage if not separately provided
+    if i_maxv >= 0:
+        out[i_maxv] = volt
+    if i_minv >= 0:
+        # Min voltage is typically lower, estimate based on voltage
+        out[i_minv] = max(volt - 0.5, 3.0)
+    if i_cur >= 0:
+        out[i_cur] = cur
+    if i_cyc >= 0:
+        out[i_cyc] = cyc
+    if i_csq >= 0:
+        out[i_csq] = cyc * cyc
+    
+    # Derived features
+    if i_vdrop >= 0 and i_maxv >= 0 and i_minv >= 0:
+        out[i_vdrop] = out[i_maxv] - out[i_minv]
+    if i_ed >= 0:
+        # Estimate energy density (voltage * time approximation)
+        voltage_val = volt if (i_volt >= 0 or i_maxv >= 0) else 3.7
+        time_val = baseline[i_tcc] if i_tcc >= 0 else 6000.0
+        out[i_ed] = voltage_val * time_val
+    if i_tdev >= 0 and i_temp >= 0:
+        # Temperature deviation (assuming mean temp ~26 based on dataset)
+        out[i_tdev] = temp - 26.0
+    
+    # Higher SOC = more time at high voltage (rough estimate)
+    if i_t415 >= 0:
+        out[i_t415] = 5000.0 + (soc / 100.0) * 1000.0
+    
+    # Rough estimate: each cycle takes approximately 10000 seconds
+    if i_expt >= 0:
+        out[i_expt] = cyc * 10000.0
+
+
+# Signature used for ahead-of-time compilation: float32 output row and
+# baseline, five float64 inputs and thirteen int64 feature indices
+FILL_FEATURES_SIGNATURE = 'void(f4[:], f4[:], f8, f8, f8, f8, f8, ' + ', '.join(['i8'] * 13) + ')'
@@ -0,0 +1,83 @@
+"""
+Prediction request schema shared by the Flask API and test_api.py
+
+Defines the input fields, their allowed ranges and the error messages the API
+returns for them. When msgspec is installed, request bodies are decoded and
+range-checked in a single pass into a PredictIn struct.
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgspec
+    from typing import Annotated
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+# (field, minimum, maximum, unit) for every prediction input, in model order
+FIELDS = (
+    ('battery_temperature', -20.0, 60.0, '°C'),
+    ('voltage', 2.5, 4.5, 'V'),
+    ('current', 0.0, 10.0, 'A'),
+    ('charging_cycles', 0.0, 10000.0, ''),
+    ('state_of_charge', 0.0, 100.0, ''),
+)
+
+REQUIRED_FIELDS = tuple(name for name, _, _, _ in FIELDS)
+
+RANGE_ERRORS = {
+    name: f"{name} must be between {low:g} and {high:g}{unit}"
+    for name, low, high, unit in FIELDS
+}
+
+
+if MSGSPEC_AVAILABLE:
+    # Validated /predict request body, with one range-checked field per FIELDS entry
+    PredictIn = msgspec.defstruct(
+        'PredictIn',
+        [(name, Annotated[float, msgspec.Meta(ge=low, le=high)]) for name, low, high, _ in FIELDS]
+    )
+
+    _DECODER = msgspec.json.Decoder(PredictIn)
+    _ENCODER = msgspec.json.Encoder()
+
+
+def decode_predict_input(body: bytes) -> Optional[Tuple[float, float, float, float, float]]:
+    """
+    Parse and validate a /predict JSON body in one pass.
+
+    Args:
+        body: Raw request body
+
+    Returns:
+        (battery_temperature, voltage, current, charging_cycles, state_of_charge)
+        as floats, or None if msgspec is unavailable or the body does not
+        validate. Callers then fall back to the dict-based validation, which
+        produces the detailed error message.
+    """
+    if not MSGSPEC_AVAILABLE:
+        return None
+    try:
+        data = _DECODER.decode(body)
+    except (msgspec.ValidationError, msgspec.DecodeError):
+        return None
+    return (float(data.battery_temperature), float(data.voltage), float(data.current),
+            float(data.charging_cycles), float(data.state_of_charge))
+
+
+def encode_predict_input(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize a complete /predict request body.
+
+    Args:
+        data: Values for every field in FIELDS; ranges are not checked so
+            out-of-range bodies can be built for tests
+
+    Returns:
+        JSON-encoded body
+    """
+    if MSGSPEC_AVAILABLE:
+        return _ENCODER.encode(PredictIn(**data))
+    return json.dumps({name: data[name] for name in REQUIRED_FIELDS}).encode()
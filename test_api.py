@@ -5,149 +5,279 @@ This script demonstrates how to use the Flask API to predict battery health.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+import http.client
+import io
 import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from schema import encode_predict_input
+
+# orjson for parsing and pretty-printing responses (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # API base URL
 BASE_URL = "http://127.0.0.1:5000"
 
+# Test output goes through this logger. By default it prints each line to
+# stdout, so the test functions report as before when imported or run under
+# pytest; configure_logging() swaps in the buffered per-test handler.
+log = logging.getLogger("apitest")
+_default_handler = logging.StreamHandler(sys.stdout)
+log.addHandler(_default_handler)
+log.setLevel(logging.INFO)
+log.propagate = False
+
+def _loads(content: bytes):
+    """Parse a JSON response body."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _pretty(obj) -> str:
+    """Format an object as JSON indented by two spaces."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+# (connect, read) timeout in seconds for every request
+TIMEOUT = (1, 5)
+
+# Retry transient gateway errors briefly. /predict is idempotent, so POST is
+# retried too; after the last attempt the response is returned as-is.
+RETRY = Retry(
+    total=2,
+    backoff_factor=0.1,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+    raise_on_status=False
+)
+
+# Shared keep-alive session so the tests reuse connections to the API
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=RETRY)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({"Content-Type": "application/json"})
+
+# Plain http.client connection for the health check, which needs none of the
+# session machinery; it is only connected on first use and then kept open
+_BASE = urlsplit(BASE_URL)
+_HEALTH_CONN = (http.client.HTTPSConnection if _BASE.scheme == "https"
+                else http.client.HTTPConnection)(_BASE.hostname, _BASE.port, timeout=2)
+
+# Sample input data
+SAMPLE_DATA = {
+    "battery_temperature": 32.5,
+    "voltage": 3.9,
+    "current": 1.2,
+    "charging_cycles": 540,
+    "state_of_charge": 76
+}
+
+# Invalid input (missing required fields)
+MISSING_FIELDS_DATA = {
+    "battery_temperature": 32.5,
+    "voltage": 3.9
+    # Missing current, charging_cycles, state_of_charge
+}
+
+# Out of range data
+OUT_OF_RANGE_DATA = {
+    "battery_temperature": 150.0,  # Too high
+    "voltage": 3.9,
+    "current": 1.2,
+    "charging_cycles": 540,
+    "state_of_charge": 150  # Too high
+}
+
+# Request bodies, serialized once (complete bodies through the shared schema)
+_VALID_PAYLOAD = encode_predict_input(SAMPLE_DATA)
+_INVALID_PAYLOAD = json.dumps(MISSING_FIELDS_DATA).encode()
+_OOR_PAYLOAD = encode_predict_input(OUT_OF_RANGE_DATA)
+_SAMPLE_PRETTY = _pretty(SAMPLE_DATA)
+
 def test_health_check():
     """Test the health check endpoint."""
-    print("Testing /health endpoint...")
+    log.info("Testing /health endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-        print("✓ Health check passed\n")
+        _HEALTH_CONN.request("GET", "/health")
+        response = _HEALTH_CONN.getresponse()
+        body = response.read()
+        log.info(f"Status Code: {response.status}")
+        log.info(f"Response: {_pretty(_loads(body))}")
+        log.info("✓ Health check passed\n")
         return True
     except Exception as e:
-        print(f"❌ Health check failed: {str(e)}\n")
+        log.info(f"❌ Health check failed: {str(e)}\n")
         return False
 
 def test_predict():
     """Test the predict endpoint with sample data."""
-    print("Testing /predict endpoint...")
-    
-    # Sample input data
-    sample_data = {
-        "battery_temperature": 32.5,
-        "voltage": 3.9,
-        "current": 1.2,
-        "charging_cycles": 540,
-        "state_of_charge": 76
-    }
+    log.info("Testing /predict endpoint...")
     
-    print(f"Input data: {json.dumps(sample_data, indent=2)}")
+    log.info(f"Input data: {_SAMPLE_PRETTY}")
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/predict",
-            json=sample_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = SESSION.post(f"{BASE_URL}/predict", data=_VALID_PAYLOAD, timeout=TIMEOUT)
         
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        log.info(f"Status Code: {response.status_code}")
+        log.info(f"Response: {_pretty(_loads(response.content))}")
         
         if response.status_code == 200:
-            print("✓ Prediction successful\n")
+            log.info("✓ Prediction successful\n")
             return True
         else:
-            print(f"❌ Prediction failed\n")
+            log.info(f"❌ Prediction failed\n")
             return False
             
     except Exception as e:
-        print(f"❌ Prediction request failed: {str(e)}\n")
+        log.info(f"❌ Prediction request failed: {str(e)}\n")
         return False
 
 def test_invalid_input():
     """Test the predict endpoint with invalid data."""
-    print("Testing /predict endpoint with invalid data...")
-    
-    # Invalid input (missing required fields)
-    invalid_data = {
-        "battery_temperature": 32.5,
-        "voltage": 3.9
-        # Missing current, charging_cycles, state_of_charge
-    }
+    log.info("Testing /predict endpoint with invalid data...")
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/predict",
-            json=invalid_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = SESSION.post(f"{BASE_URL}/predict", data=_INVALID_PAYLOAD, timeout=TIMEOUT)
         
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        log.info(f"Status Code: {response.status_code}")
+        log.info(f"Response: {_pretty(_loads(response.content))}")
         
         if response.status_code == 400:
-            print("✓ Error handling working correctly\n")
+            log.info("✓ Error handling working correctly\n")
             return True
         else:
-            print(f"⚠ Unexpected status code\n")
+            log.info(f"⚠ Unexpected status code\n")
             return False
             
     except Exception as e:
-        print(f"❌ Test failed: {str(e)}\n")
+        log.info(f"❌ Test failed: {str(e)}\n")
         return False
 
 def test_out_of_range_values():
     """Test the predict endpoint with out-of-range values."""
-    print("Testing /predict endpoint with out-of-range values...")
-    
-    # Out of range data
-    invalid_data = {
-        "battery_temperature": 150.0,  # Too high
-        "voltage": 3.9,
-        "current": 1.2,
-        "charging_cycles": 540,
-        "state_of_charge": 150  # Too high
-    }
+    log.info("Testing /predict endpoint with out-of-range values...")
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/predict",
-            json=invalid_data,
-            headers={"Content-Type": "application/json"}
-        )
+        response = SESSION.post(f"{BASE_URL}/predict", data=_OOR_PAYLOAD, timeout=TIMEOUT)
         
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        log.info(f"Status Code: {response.status_code}")
+        log.info(f"Response: {_pretty(_loads(response.content))}")
         
         if response.status_code == 400:
-            print("✓ Validation working correctly\n")
+            log.info("✓ Validation working correctly\n")
             return True
         else:
-            print(f"⚠ Unexpected status code\n")
+            log.info(f"⚠ Unexpected status code\n")
             return False
             
     except Exception as e:
-        print(f"❌ Test failed: {str(e)}\n")
+        log.info(f"❌ Test failed: {str(e)}\n")
         return False
 
-if __name__ == "__main__":
-    print("=" * 60)
-    print("Battery Health Prediction API - Test Script")
-    print("=" * 60)
-    print("\nMake sure the Flask server is running on http://127.0.0.1:5000")
-    print("Start the server with: python app.py\n")
-    print("=" * 60)
+# Tests run by the script, in report order
+TESTS = (
+    ("Health Check", test_health_check),
+    ("Predict (Valid Input)", test_predict),
+    ("Predict (Invalid Input)", test_invalid_input),
+    ("Predict (Out of Range)", test_out_of_range_values),
+)
+
+class _PerTestHandler(logging.Handler):
+    """
+    Logging handler that keeps each test thread's lines in its own buffer.
+    
+    Lines logged outside capture() go straight to the stream. The stream is
+    only flushed on flush(), so a whole run costs a handful of writes.
+    """
+    
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self._local = threading.local()
+    
+    def emit(self, record):
+        buffer = getattr(self._local, 'buffer', None)
+        (buffer if buffer is not None else self.stream).write(self.format(record) + "\n")
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def capture(self, test_fn):
+        """Run test_fn with its log lines buffered; return (result, output)."""
+        self._local.buffer = io.StringIO()
+        try:
+            return test_fn(), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+def configure_logging() -> _PerTestHandler:
+    """Send the test log to a block-buffered stdout stream."""
+    stream = io.TextIOWrapper(sys.stdout.buffer, encoding=sys.stdout.encoding,
+                              write_through=False)
+    handler = _PerTestHandler(stream)
+    log.removeHandler(_default_handler)
+    log.addHandler(handler)
+    return handler
+
+def run_tests_concurrently(handler: _PerTestHandler, tests=TESTS):
+    """
+    Run the API tests in parallel threads.
+    
+    Each test's log is buffered and written in test order once all tests
+    have finished, so the log reads the same as a sequential run.
+    
+    Args:
+        handler: Handler returned by configure_logging()
+        tests: (name, test function) pairs
+    
+    Returns:
+        List of (test_name, passed) tuples
+    """
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [(name, executor.submit(handler.capture, fn)) for name, fn in tests]
+        outcomes = [(name, future.result()) for name, future in futures]
     
-    # Run tests
     results = []
+    for name, (passed, output) in outcomes:
+        handler.stream.write(output)
+        results.append((name, passed))
+    return results
+
+if __name__ == "__main__":
+    handler = configure_logging()
     
-    results.append(("Health Check", test_health_check()))
-    results.append(("Predict (Valid Input)", test_predict()))
-    results.append(("Predict (Invalid Input)", test_invalid_input()))
-    results.append(("Predict (Out of Range)", test_out_of_range_values()))
+    log.info("=" * 60)
+    log.info("Battery Health Prediction API - Test Script")
+    log.info("=" * 60)
+    log.info("\nMake sure the Flask server is running on http://127.0.0.1:5000")
+    log.info("Start the server with: python app.py\n")
+    log.info("=" * 60)
+    
+    # Run tests
+    results = run_tests_concurrently(handler)
     
     # Summary
-    print("=" * 60)
-    print("Test Summary")
-    print("=" * 60)
+    log.info("=" * 60)
+    log.info("Test Summary")
+    log.info("=" * 60)
     for test_name, result in results:
         status = "✓ PASSED" if result else "❌ FAILED"
-        print(f"{test_name}: {status}")
+        log.info(f"{test_name}: {status}")
     
-    print("=" * 60)
-
+    log.info("=" * 60)
+    
+    # Write the buffered log and release stdout's buffer
+    handler.flush()
+    handler.stream.detach()